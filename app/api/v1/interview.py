@@ -124,12 +124,13 @@ async def generate_interview_questions(
                         question_count = len(result_data.get("questions", []))
                         logger.info(f"📤 Streaming result for '{skill_name}' ({question_count} questions)")
                         
-                        data = InterviewQuestionState(
+                        # Serialize straight from the model (no intermediate dict + json.dumps pass)
+                        data_str = InterviewQuestionState(
                             skill=skill_name,
                             questions=result_data["questions"],
                             isLoading=False
-                        ).model_dump()
-                        yield json.dumps(data) + "\n"
+                        ).model_dump_json()
+                        yield data_str + "\n"
                     
                     elif event["type"] == "quota_error":
                         # Stream quota error with distinct type for frontend
@@ -147,23 +148,22 @@ async def generate_interview_questions(
                     elif event["type"] == "error":
                         # Stream error results as NDJSON
                         error_data = event["content"]
-                        data = InterviewQuestionState(
+                        data_str = InterviewQuestionState(
                             skill=error_data.get("skill", "Error"),
                             error=error_data.get("error", "Unknown error"),
                             isLoading=False
-                        ).model_dump()
-                        data_str = json.dumps(data)
+                        ).model_dump_json()
                         logger.debug(f"Yielding data: {data_str[:100]}...")
                         yield data_str + "\n"
                 
             except Exception as e:
                 logger.error(f"Error in response generator: {e}", exc_info=True)
-                error_data = InterviewQuestionState(
+                error_str = InterviewQuestionState(
                     skill="Error",
                     error=str(e),
                     isLoading=False
-                ).model_dump()
-                yield json.dumps(error_data) + "\n"
+                ).model_dump_json()
+                yield error_str + "\n"
             finally:
                 # Step 6: Cleanup file after streaming completes
                 cleanup_file(file_location)
@@ -34,6 +34,7 @@ class Settings(BaseSettings):
     # Service Specific Limits (Requests Per Minute)
     GEMINI_RPM: int = 5
     GROQ_RPM: int = 60
+    GEMINI_TPM: int = 250_000  # Input tokens per minute (estimated from prompt length)
     # Note: Groq handles both LLaMA 3.3 70B and GPT-OSS 120B models
     
     # Note: Daily limits removed - each API enforces its own quotas
@@ -43,7 +44,17 @@ class Settings(BaseSettings):
     # Retry Configuration
     RETRY_MAX_ATTEMPTS: int = 3
     RETRY_BASE_DELAY: float = 1.0
-    RETRY_MAX_DELAY: float = 60.0
+    RETRY_MAX_DELAY: float = 60.0  # Cap for exponential backoff (server-requested delays are honoured up to RETRY_HARD_CAP)
+    RETRY_HARD_CAP: float = 120.0  # Server-requested delays above this fail fast instead of sleeping
+
+    # Response Cache (identical prompts skip the rate limiter and the API call)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256  # 0 disables the cache
+    RESPONSE_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Source Cache (per-skill discovery results persisted across runs)
+    SOURCE_CACHE_ENABLED: bool = True
+    SOURCE_CACHE_PATH: str = str(PROJECT_ROOT / '.cache' / 'source_discovery.sqlite3')
+    SOURCE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 7 days
    
     # Pipeline Configuration
     SKILL_COUNT: int = 9
@@ -51,7 +62,9 @@ class Settings(BaseSettings):
     
     # Concurrency Configuration
     MAX_CONCURRENT_BATCHES: int = 3
-    SOURCE_DISCOVERY_CONCURRENCY: int = 3
+    SOURCE_DISCOVERY_CONCURRENCY: int = 3  # Starting point for adaptive Gemini concurrency
+    SOURCE_DISCOVERY_MAX_CONCURRENCY: int = 6  # Ceiling it may grow to while calls succeed
+    SOURCE_DISCOVERY_BATCH_SIZE: int = 10  # Max skills per grounded-search call; effective size is min(BATCH_SIZE, this)
     MAX_SOURCES_PER_SKILL: int = 3  # Maximum sources per skill for quality
     
     # Performance Optimization
@@ -8,15 +8,26 @@ This module handles the parallel processing of skill batches:
 """
 import asyncio
 import logging
+import re
 from typing import List, Set
 from app.schemas.interview import AllSkillSources,SkillSources
 from app.services.tools.source_discovery import discover_sources
+from app.services.tools.helpers import NO_SOURCES_PREFIX
 from app.services.pipeline.llm_service import LLMService
 from app.core.prompts import generate_questions_prompt, generate_contextfree_questions_prompt
 from app.services.tools.rate_limiter import ERR_QUOTA_EXHAUSTED, ERR_MODEL_OVERLOADED, ERR_BILLING_REQUIRED
 
 logger = logging.getLogger(__name__)
 
+# Error classification patterns, compiled once (case-insensitive: no lowercased copies)
+_OVERLOAD_PATTERN = re.compile(
+    '|'.join(map(re.escape, (ERR_MODEL_OVERLOADED, "503", "overloaded"))), re.IGNORECASE
+)
+_QUOTA_PATTERN = re.compile(
+    '|'.join(map(re.escape, (ERR_QUOTA_EXHAUSTED, ERR_BILLING_REQUIRED, "quota", "limit", "exhausted"))),
+    re.IGNORECASE
+)
+
 class BatchProcessor:
     """
     Processes skill batches through the source discovery and question generation pipeline.
@@ -27,12 +38,11 @@ class BatchProcessor:
     
     def _classify_error(self, e: Exception) -> str:
         """Classify error type using consolidated patterns."""
-        error_msg = str(e).lower()
-        if e.__cause__: error_msg += f" {str(e.__cause__).lower()}"
+        messages = (str(e), str(e.__cause__)) if e.__cause__ else (str(e),)
         
-        if any(k in error_msg for k in [ERR_MODEL_OVERLOADED, "503", "overloaded"]):
+        if any(_OVERLOAD_PATTERN.search(m) for m in messages):
             return "service_overload"
-        if any(k in error_msg for k in [ERR_QUOTA_EXHAUSTED, ERR_BILLING_REQUIRED, "quota", "limit", "exhausted"]):
+        if any(_QUOTA_PATTERN.search(m) for m in messages):
             return "quota_error"
         return "unknown"
     
@@ -59,7 +69,7 @@ class BatchProcessor:
             # Identify skills with valid content
             valid_source_skills = {
                 s['skill'] for s in source_list 
-                if s.get('extracted_content') and "No sources found" not in s['extracted_content']
+                if s.get('extracted_content') and not s['extracted_content'].startswith(NO_SOURCES_PREFIX)
             }
 
             
@@ -3,33 +3,53 @@ import logging
 import json
 import re
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Compile regex patterns once at module level for performance
+_CODE_FENCE_PATTERN = re.compile(r'```(?:json\s*)?')
+_JSON_DECODER = json.JSONDecoder()
+
+# Prefer orjson (native parser/serializer); orjson.JSONDecodeError subclasses json.JSONDecodeError
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 
 def clean_llm_json_output(raw_text: str) -> str:
     """Cleans LLM output to extract valid JSON."""
     if not raw_text:
         return ""
     
-    # Remove markdown code blocks
-    text = re.sub(r'```json\s*', '', raw_text)
-    text = re.sub(r'```', '', text)
+    # Remove markdown code blocks (cheap substring test skips the regex passes)
+    text = raw_text
+    if '```' in text:
+        text = _CODE_FENCE_PATTERN.sub('', text)
     
     # Try standard JSON parsing
     try:
-        decoded_object = json.loads(text)
-        return json.dumps(decoded_object)
+        decoded_object = _json_loads(text)
+        return _json_dumps(decoded_object)
     except json.JSONDecodeError:
         pass
     
-    # Fallback: extract JSON from text
+    # Fallback: decode the first JSON object embedded in the text in a single pass
     start_idx = text.find('{')
-    end_idx = text.rfind('}')
-    if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+    if start_idx != -1:
         try:
-            extracted = text[start_idx:end_idx+1]
-            json.loads(extracted)  # Validate
-            return extracted
+            _, end_idx = _JSON_DECODER.raw_decode(text, start_idx)
+            return text[start_idx:end_idx]
         except json.JSONDecodeError:
             pass
     
@@ -52,7 +72,7 @@ def parse_llm_response(
             raw_content = str(result)
 
         cleaned_json = clean_llm_json_output(raw_content)
-        data = json.loads(cleaned_json)
+        data = _json_loads(cleaned_json)
         return schema_class(**data)
 
     except Exception as e:
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import re
 import time
 from typing import Any, Optional, Type
 
@@ -10,6 +11,12 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Transient failures worth retrying, compiled once (case-insensitive: no lowercased copy)
+_RETRYABLE_PATTERN = re.compile(
+    r'rate limit|timeout|unavailable|bad gateway|connection reset|temporary failure|503|504|502',
+    re.IGNORECASE
+)
+
 class LLMService:
     """
     Service for handling Direct LLM interactions, including token estimation and parsing.
@@ -121,9 +128,4 @@ class LLMService:
     @staticmethod
     def _is_retryable(error: Exception) -> bool:
         """Check if an error is retryable."""
-        error_str = str(error).lower()
-        retry_keywords = [
-            "rate limit", "timeout", "unavailable", "bad gateway",
-            "connection reset", "temporary failure", "503", "504", "502"
-        ]
-        return any(k in error_str for k in retry_keywords)
+        return _RETRYABLE_PATTERN.search(str(error)) is not None
@@ -1,20 +1,49 @@
 import logging
 import re
-from typing import Optional, Dict, List, Any
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, Tuple
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    fuzz = None
+    fuzz_process = None
 
 logger = logging.getLogger(__name__)
 
+# Placeholder content prefixes: a result starting with one of these holds no real sources
+NO_SOURCES_PREFIX = "No sources found"
+FALLBACK_PREFIX = "Fallback response for"
+
+# Minimum rapidfuzz token_sort_ratio score (0-100) for a header to count as a skill.
+# Typos and word order are tolerated, but unlike WRatio short partial overlaps
+# ("Data Types" vs "Data Structures") are not scored up
+_FUZZY_MATCH_CUTOFF = 85
+
 # Compile regex patterns once at module level for performance
 _HEADER_PATTERN = re.compile(r'(?m)^(?:#{2,6}|\*\*)\s*(.+?)(?::)?\s*$')
 _CLEANUP_PATTERN = re.compile(r'[^\w\s-]')
 _WHITESPACE_PATTERN = re.compile(r'\s+')
 
+@dataclass(slots=True)
+class _Section:
+    """Parse state for one skill's section of a batch response (offsets into the raw text)."""
+    content: str = ""
+    source_count: int = 0
+    found: bool = False
+    start_idx: int = 0
+    end_idx: int = 0
+
 def create_fallback_sources(
     skill: str,
     error_message: Optional[str] = None
 ) -> Dict[str, str]:
     """Create fallback content when primary search fails."""
-    content_msg = f"Fallback response for {skill}. Consider manual search for better results."
+    content_msg = f"{FALLBACK_PREFIX} {skill}. Consider manual search for better results."
     if error_message:
         # Sanitize error message
         clean_err = error_message.replace('"', "'").replace('\n', ' ')
@@ -46,16 +75,16 @@ def parse_batch_response(raw_text: str, skills: List[str], grounding_meta: Any =
     
     Optimized for single-pass processing using pre-compiled regex patterns.
     """
-    # Create normalization map once
-    skill_map = {_normalize_text(s): s for s in skills}
-    results_map = {s: {"content": "", "source_count": 0, "found": False} for s in skills}
+    # Create normalization map once (interned keys let dict lookups short-circuit on identity)
+    skill_map = {sys.intern(_normalize_text(s)): s for s in skills}
+    results_map = {s: _Section() for s in skills}
     
     # Find all sections locally - generator for memory efficiency
     matches = list(_HEADER_PATTERN.finditer(raw_text))
     
     for i, match in enumerate(matches):
         header_text = match.group(1).strip()
-        header_normalized = _normalize_text(header_text)
+        header_normalized = sys.intern(_normalize_text(header_text))
         
         # Calculate content boundaries
         start_idx = match.start()
@@ -64,6 +93,7 @@ def parse_batch_response(raw_text: str, skills: List[str], grounding_meta: Any =
         # Simplified Matching Strategy
         # 1. Exact normalized match
         # 2. Substring match (bi-directional)
+        # 3. Fuzzy match (rapidfuzz, if installed) for near-misses like "kubernets" / "learning machine"
         matched_skill = skill_map.get(header_normalized)
         
         if not matched_skill:
@@ -73,89 +103,125 @@ def parse_batch_response(raw_text: str, skills: List[str], grounding_meta: Any =
                     matched_skill = original_skill
                     break
         
+        if not matched_skill and RAPIDFUZZ_AVAILABLE:
+            # Only skills still without a section: a near-miss sub-header must not
+            # replace content an exact or substring match already found
+            unfound = [
+                norm_key for norm_key, original_skill in skill_map.items()
+                if not results_map[original_skill].found
+            ]
+            best = fuzz_process.extractOne(
+                header_normalized, unfound, scorer=fuzz.token_sort_ratio, score_cutoff=_FUZZY_MATCH_CUTOFF
+            ) if unfound else None
+            if best:
+                matched_skill = skill_map[best[0]]
+        
         if matched_skill:
-            # Extract content
-            section_content = raw_text[start_idx:end_idx].strip()
-            
-            # Remove header line from content if present
-            lines = section_content.split('\n', 1)
-            body_text = lines[1].strip() if len(lines) > 1 else lines[0].strip()
+            # Extract content by offsets: skip the header line without copying the
+            # whole section first (sections start at the header, never whitespace)
+            header_end = raw_text.find('\n', start_idx, end_idx)
+            body_text = raw_text[header_end + 1:end_idx].strip() if header_end != -1 else ""
+            if not body_text:
+                # Header-only section: keep the header line itself, as before
+                body_text = raw_text[start_idx:end_idx].strip()
             
             # Clean up potential secondary header artifacts
             if body_text.startswith('##'):
                 lines_cleaned = body_text.split('\n', 1)
                 body_text = lines_cleaned[1].strip() if len(lines_cleaned) > 1 else ""
                 
-            results_map[matched_skill].update({
-                "content": body_text,
-                "found": True,
-                "start_idx": start_idx,
-                "end_idx": end_idx
-            })
+            section = results_map[matched_skill]
+            section.content = body_text
+            section.found = True
+            section.start_idx = start_idx
+            section.end_idx = end_idx
         else:
             logger.debug(f"Unmatched header: '{header_text}'")
 
     # Map grounding metadata if available
-    if grounding_meta and hasattr(grounding_meta, 'grounding_supports') and grounding_meta.grounding_supports:
-        _map_grounding_metadata(results_map, grounding_meta)
+    supports = _extract_supports(grounding_meta) if grounding_meta else []
+    if supports:
+        _map_grounding_metadata(results_map, supports)
 
     # Format final output
     return _build_final_output(skills, results_map)
 
-def _map_grounding_metadata(results_map: Dict[str, Dict], grounding_meta: Any) -> None:
-    """Helper to map grounding metadata to matched sections."""
-    chunks = getattr(grounding_meta, 'grounding_chunks', []) or []
-    supports = grounding_meta.grounding_supports
+def _extract_supports(grounding_meta: Any) -> List[Tuple[int, Tuple[str, ...]]]:
+    """
+    Flatten grounding metadata into (segment start, source URLs) tuples in one pass.
+
+    Each chunk's URL is resolved once, however many supports cite it, so the mapping
+    below works on plain tuples instead of walking SDK objects per citation.
+    """
+    supports = getattr(grounding_meta, 'grounding_supports', None)
+    if not supports:
+        return []
     
-    # Initialize URL sets for each skill
-    skill_urls = {skill: set() for skill in results_map.keys() if results_map[skill]["found"]}
+    chunk_urls = []
+    for chunk in getattr(grounding_meta, 'grounding_chunks', None) or []:
+        web = getattr(chunk, 'web', None)
+        chunk_urls.append(getattr(web, 'uri', None) if web is not None else None)
+    num_chunks = len(chunk_urls)
     
-    # Build range lookup
+    flat = []
+    for support in supports:
+        # Both fields are Optional in the SDK (e.g. supports on intro text carry no indices)
+        indices = getattr(support, 'grounding_chunk_indices', None)
+        if not indices:
+            continue
+        s_start = getattr(getattr(support, 'segment', None), 'start_index', 0) or 0
+        urls = tuple(
+            url for chunk_idx in indices
+            if 0 <= chunk_idx < num_chunks and (url := chunk_urls[chunk_idx])
+        )
+        flat.append((s_start, urls))
+    return flat
+
+def _map_grounding_metadata(results_map: Dict[str, _Section], supports: List[Tuple[int, Tuple[str, ...]]]) -> None:
+    """Helper to map flattened grounding supports (see _extract_supports) to matched sections."""
+    # One pass over the sections: URL set and range lookup for each found skill
+    skill_urls = {}
     ranges = []
-    for skill, data in results_map.items():
-        if data["found"]:
-            ranges.append((data["start_idx"], data["end_idx"], skill))
+    for skill, section in results_map.items():
+        if section.found:
+            skill_urls[skill] = set()
+            ranges.append((section.start_idx, section.end_idx, skill))
+    
+    # Sections never overlap, so sorted by start a binary search finds the only candidate
+    ranges.sort()
+    starts = [start for start, _, _ in ranges]
             
-    for support in supports:
-        s_start = getattr(support.segment, 'start_index', 0) or 0
-        
-        # Find which skill section this support belongs to
-        for start, end, skill in ranges:
-            if start <= s_start < end:
-                # Extract all URLs from this support's grounding chunks
-                for chunk_idx in support.grounding_chunk_indices:
-                    if chunk_idx < len(chunks):
-                        try:
-                            chunk = chunks[chunk_idx]
-                            url = chunk.web.uri if hasattr(chunk, 'web') else None
-                            if url:
-                                skill_urls[skill].add(url)
-                        except Exception:
-                            continue
-                break  # Support belongs to one skill section only
+    for s_start, urls in supports:
+        # Find which skill section this support belongs to: O(log sections)
+        pos = bisect_right(starts, s_start) - 1
+        if pos < 0:
+            continue
+        _, end, skill = ranges[pos]
+        if s_start < end:
+            skill_urls[skill].update(urls)
     
     # Update results with counts
     for skill, urls in skill_urls.items():
         if urls:
-            results_map[skill]["source_count"] = len(urls)
+            results_map[skill].source_count = len(urls)
 
-def _build_final_output(skills: List[str], results_map: Dict[str, Dict]) -> List[Dict[str, Any]]:
+def _build_final_output(skills: List[str], results_map: Dict[str, _Section]) -> List[Dict[str, Any]]:
     """Build the final list of results preserving original skill order."""
     final_output = []
     
     for skill in skills:
-        data = results_map[skill]
-        if data["found"]:
+        section = results_map[skill]
+        if section.found:
             final_output.append({
                 "skill": skill,
-                "extracted_content": data["content"],
+                "extracted_content": section.content,
             })
-            if data["source_count"] > 0:
-                logger.info(f"Skill '{skill}' synthesized from {data['source_count']} sources.")
+            if section.source_count > 0:
+                logger.info(f"Skill '{skill}' synthesized from {section.source_count} sources.")
         else:
             final_output.append({
                 "skill": skill,
-                "extracted_content": f"No sources found for '{skill}'. Consider manual research for this skill."
+                "extracted_content": f"{NO_SOURCES_PREFIX} for '{skill}'. Consider manual research for this skill."
             })
             
     return final_output
\ No newline at end of file
@@ -1,9 +1,14 @@
 from __future__ import annotations
 import asyncio
+import hashlib
 import logging
+import random
 import re
-from collections import deque, defaultdict
-from datetime import datetime, timezone, timedelta
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Callable, Any, Dict, Optional, Tuple
 
 from google.api_core.exceptions import (
@@ -26,68 +31,346 @@ ERR_QUOTA_EXHAUSTED = "quota exhausted"
 ERR_MODEL_OVERLOADED = "model overloaded"
 ERR_BILLING_REQUIRED = "billing/plan upgrade required"
 
+# Errors worth retrying (rate limits, transient server faults), built once at import
+_RETRYABLE_ERRORS: Tuple[type, ...] = (ResourceExhausted, TooManyRequests, ServiceUnavailable, InternalServerError)
+if GEMINI_ERRORS_AVAILABLE:
+    _RETRYABLE_ERRORS += (GeminiClientError,)
+
+# Hard billing quotas that require manual intervention
+_HARD_QUOTA_PATTERN = re.compile(r'upgrade your plan|enable billing|billing must be enabled', re.IGNORECASE)
+
+# Runtime quota exhaustion (Gemini): "RESOURCE_EXHAUSTED" status,
+# "exceeded your current quota" message, or a 429 status code (as a whole number, so
+# ids or byte counts that merely contain "429" don't fail a retryable call)
+_QUOTA_EXHAUSTED_PATTERN = re.compile(
+    r'resource_exhausted|exceeded your current quota|quota exceeded|\b429\b', re.IGNORECASE
+)
+
+# Which quota a 429 violated, from the QuotaFailure details in the error body
+# (JSON "quotaId" or proto "quota_id"), e.g. "GenerateRequestsPerDayPerProjectPerModel-FreeTier".
+# Bounded quantifiers, as below, keep the scan linear on large bodies.
+_DAILY_QUOTA_PATTERN = re.compile(r'quota_?id\W{1,8}[\w-]{0,80}?PerDay', re.IGNORECASE)
+_PER_MINUTE_QUOTA_PATTERN = re.compile(r'quota_?id\W{1,8}[\w-]{0,80}?PerMinute', re.IGNORECASE)
+
+# Gemini 503 "model is overloaded" (matched case-insensitively, without a lowercased copy)
+_OVERLOADED_PATTERN = re.compile(r'overloaded', re.IGNORECASE)
+
+# Retry hints in error bodies: "retry in 5s", "retryDelay: '5s'".
+# Quantifiers are bounded so a long error body can't drive unbounded scanning/backtracking.
+_RETRY_DELAY_PATTERN = re.compile(r'(?:retry in\s{0,4}|retryDelay\D{1,8})([\d.]+)s?', re.IGNORECASE)
+
 class ServiceRateLimiter:
     """
-    Simple rate limiter handling RPM limits.
+    Token-bucket rate limiter handling RPM limits.
+
+    Buckets hold at most one token, so calls are paced evenly at 60/limit seconds
+    apart: any 60s window sees at most `limit` calls, like a sliding log, with O(1)
+    state. A deeper bucket would let a full burst plus a minute of refill through.
     """
+    __slots__ = ('_rpm_limits', '_rates', '_buckets')
+
     def __init__(self):
-        # RPM tracking (sliding window - last 1 minute)
-        self._services: Dict[str, deque] = defaultdict(deque)
         self._rpm_limits = {
             'gemini': settings.GEMINI_RPM,
             'groq': settings.GROQ_RPM,
             'default': settings.GEMINI_RPM
         }
-        self._lock = asyncio.Lock()
+        # State is seeded for exactly the known services, so a mistyped service name
+        # fails loudly instead of silently getting a fresh, unthrottled bucket.
+
+        # (capacity, refill tokens per second) per service, derived once from the RPM limits
+        self._rates: Dict[str, Tuple[float, float]] = {
+            service: (1.0, limit / 60.0) for service, limit in self._rpm_limits.items()
+        }
+
+        # RPM tracking (token bucket per service: tokens, last refill in monotonic seconds).
+        # A last refill of 0.0 starts the bucket full, since refill is capped at capacity.
+        self._buckets: Dict[str, Tuple[float, float]] = {
+            service: (1.0, 0.0) for service in self._rpm_limits
+        }
+
+    def slot(self, service: str) -> "_RateLimitSlot":
+        """
+        Async context manager form of acquire_slot.
+
+        Limit dimensions stack as contexts (``async with rpm.slot(s), other.slot(s):``),
+        so a new one can be added without touching the existing ones.
+        """
+        return _RateLimitSlot(self, service)
 
     async def acquire_slot(self, service: str) -> None:
         """Blocks until a slot is available for the given service (RPM only)."""
-        while True:
-            async with self._lock:
-                wait_time = self._check_rpm(service, datetime.now(timezone.utc))
-                if wait_time == 0:
-                    return
-
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-
-    def _check_rpm(self, service: str, now: datetime) -> float:
-        """Check RPM limits and return wait time if needed."""
-        history = self._services[service]
-        limit = self._rpm_limits.get(service, self._rpm_limits['default'])
-
-        # Cleanup old requests
-        while history and history[0] < now - timedelta(minutes=1):
-            history.popleft()
-
-        # Check limit
-        if len(history) >= limit:
-            wait_time = (history[0] + timedelta(minutes=1) - now).total_seconds()
-            if wait_time > 0:
-                logger.debug(f"RPM limit for {service}. Waiting {wait_time:.2f}s")
-                return wait_time
-        
-        history.append(now)
+        # The running loop's clock is the same monotonic clock, already in hand.
+        # No lock needed: the reservation never awaits, so it runs atomically on the
+        # event loop and the fast path (token available) never touches a scheduler primitive.
+        wait_time = self._reserve_rpm(service, asyncio.get_running_loop().time())
+
+        # The slot is already reserved, so each waiter wakes exactly once
+        # instead of re-polling the bucket (no thundering herd).
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def _reserve_rpm(self, service: str, now: float) -> float:
+        """Reserve an RPM slot and return how long to wait until it is due."""
+        tokens, refill_rate = self._refill(service, now)
+        # Tokens may go negative: the deficit is the queue of reserved future slots.
+        tokens -= 1.0
+        self._buckets[service] = (tokens, now)
+
+        if tokens < 0:
+            wait_time = -tokens / refill_rate
+            logger.debug("RPM limit for %s. Waiting %.2fs", service, wait_time)
+            return wait_time
         return 0.0
 
+    def _refill(self, service: str, now: float) -> Tuple[float, float]:
+        """Bring a bucket up to date and return (tokens, refill rate per second)."""
+        # Hoist attribute/dict lookups into locals
+        buckets = self._buckets
+        bucket = buckets.get(service)
+        if bucket is None:
+            raise KeyError(f"Unknown rate-limited service: '{service}'")
+        tokens, last_refill = bucket
+        capacity, refill_rate = self._rates[service]
+
+        # Lazy refill: O(1) arithmetic instead of evicting a timestamp log.
+        tokens = min(capacity, tokens + (now - last_refill) * refill_rate)
+        buckets[service] = (tokens, now)
+        return tokens, refill_rate
+
+class _RateLimitSlot:
+    """Holds one reserved slot of a ServiceRateLimiter for the duration of an `async with`."""
+    __slots__ = ('_limiter', '_service')
+
+    def __init__(self, limiter: ServiceRateLimiter, service: str):
+        self._limiter = limiter
+        self._service = service
+
+    async def __aenter__(self) -> None:
+        await self._limiter.acquire_slot(self._service)
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        # RPM slots are spent on entry; nothing to hand back
+        return False
+
 # Global Instance
 rate_limiter = ServiceRateLimiter()
 
-def parse_retry_after(exception: Exception) -> float:
-    """Extracts wait time from API error responses."""
+class TokenBucket:
+    """
+    Tokens-per-minute budget for one service, with the same reservation scheme as
+    ServiceRateLimiter: the bucket may go negative and each caller sleeps once.
+    """
+    __slots__ = ('_capacity', '_refill_rate', '_tokens', '_last_refill')
+
+    def __init__(self, tokens_per_minute: int):
+        self._capacity = float(tokens_per_minute)
+        self._refill_rate = tokens_per_minute / 60.0
+        # Starts full (refill is capped at capacity)
+        self._tokens = self._capacity
+        self._last_refill = 0.0
+
+    def slot(self, cost: int) -> "_TokenSlot":
+        """Async context manager that reserves `cost` tokens on entry."""
+        return _TokenSlot(self, cost)
+
+    async def acquire(self, cost: int) -> None:
+        """Blocks until `cost` tokens are available, reserving them."""
+        now = asyncio.get_running_loop().time()
+        capacity = self._capacity
+        tokens = min(capacity, self._tokens + (now - self._last_refill) * self._refill_rate)
+        # A request larger than the whole budget waits for a full bucket, not forever
+        tokens -= min(float(cost), capacity)
+        self._tokens = tokens
+        self._last_refill = now
+
+        if tokens < 0:
+            wait_time = -tokens / self._refill_rate
+            logger.debug("TPM limit reached. Waiting %.2fs for %d tokens", wait_time, cost)
+            await asyncio.sleep(wait_time)
+
+class _TokenSlot:
+    """Reserves tokens of a TokenBucket for the duration of an `async with`."""
+    __slots__ = ('_bucket', '_cost')
+
+    def __init__(self, bucket: TokenBucket, cost: int):
+        self._bucket = bucket
+        self._cost = cost
+
+    async def __aenter__(self) -> None:
+        await self._bucket.acquire(self._cost)
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        # Tokens are spent on entry, like RPM slots
+        return False
+
+# Per-service TPM budgets; services without an entry are only RPM-limited
+_TOKEN_BUCKETS: Dict[str, TokenBucket] = {
+    'gemini': TokenBucket(settings.GEMINI_TPM),
+}
+
+def _is_throttle_error(exc: BaseException) -> bool:
+    """True for errors that mean "slow down" (HTTP 429), as opposed to transient faults."""
+    if isinstance(exc, (ResourceExhausted, TooManyRequests)):
+        return True
+    return GEMINI_ERRORS_AVAILABLE and isinstance(exc, GeminiClientError) and getattr(exc, 'code', None) == 429
+
+class AdaptiveSemaphore:
+    """
+    Concurrency limit that tracks server capacity (AIMD).
+
+    Additive increase: one more permit after `increase_after` consecutive successes,
+    up to `maximum`. Multiplicative decrease: the limit halves on a throttle error,
+    down to `minimum`. Used as `async with`; the outcome is read in __aexit__.
+    """
+    __slots__ = ('_limit', '_minimum', '_maximum', '_increase_after', '_successes', '_in_flight', '_cond')
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1, increase_after: int = 10):
+        self._minimum = max(1, minimum)
+        self._maximum = max(self._minimum, maximum)
+        self._limit = min(max(initial, self._minimum), self._maximum)
+        self._increase_after = increase_after
+        self._successes = 0
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def _has_capacity(self) -> bool:
+        return self._in_flight < self._limit
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(self._has_capacity)
+            self._in_flight += 1
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        # Bookkeeping never awaits, so it is atomic on the event loop
+        self._in_flight -= 1
+        if exc is None:
+            self._successes += 1
+            if self._successes >= self._increase_after and self._limit < self._maximum:
+                self._limit += 1
+                self._successes = 0
+                logger.debug("Adaptive concurrency raised to %d", self._limit)
+        elif _is_throttle_error(exc):
+            self._successes = 0
+            if self._limit > self._minimum:
+                self._limit = max(self._minimum, self._limit // 2)
+                logger.info("Throttled - adaptive concurrency lowered to %d", self._limit)
+
+        # Wake exactly as many waiters as there are free permits
+        free = self._limit - self._in_flight
+        if free > 0:
+            async with self._cond:
+                self._cond.notify(free)
+        return False
+
+# Per-service adaptive concurrency; services without an entry are only RPM-limited
+_CONCURRENCY_LIMITS: Dict[str, AdaptiveSemaphore] = {
+    'gemini': AdaptiveSemaphore(settings.SOURCE_DISCOVERY_CONCURRENCY, settings.SOURCE_DISCOVERY_MAX_CONCURRENCY),
+}
+
+# Sentinel for cache misses, so a cached falsy response still counts as a hit
+_CACHE_MISS = object()
+
+class ResponseCache:
+    """
+    In-memory TTL + LRU cache of successful API responses.
+
+    A hit returns without consuming a rate-limiter slot or making a network call.
+    """
+    __slots__ = ('_max_entries', '_ttl', '_entries')
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        # key -> (expiry in monotonic seconds, response); order is least recently used first
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        """Return the cached response, or _CACHE_MISS if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _CACHE_MISS
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return _CACHE_MISS
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: Any) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        if self._max_entries <= 0:
+            return
+        entries = self._entries
+        entries[key] = (time.monotonic() + self._ttl, response)
+        entries.move_to_end(key)
+        if len(entries) > self._max_entries:
+            entries.popitem(last=False)
+
+def make_cache_key(*parts: str) -> str:
+    """Build a response cache key from everything that determines the response (model, prompt, ...)."""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+class _KeyLock:
+    """Per-cache-key lock, dropped once no caller holds or awaits it."""
+    __slots__ = ('lock', 'users')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+# In-flight calls by cache key (single-flight for identical requests)
+_KEY_LOCKS: Dict[str, _KeyLock] = {}
+
+# Global Instance
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+# Retry policy, read from settings once: fixed for the process lifetime
+_RETRY_MAX_ATTEMPTS = settings.RETRY_MAX_ATTEMPTS
+_RETRY_MAX_DELAY = settings.RETRY_MAX_DELAY
+_RETRY_HARD_CAP = settings.RETRY_HARD_CAP
+
+# Exponential backoff caps, built once: the retry policy is fixed for the process lifetime.
+# The actual sleep is drawn from [0, cap] (full jitter) so concurrent callers desynchronize.
+_BACKOFF_DELAYS: Tuple[float, ...] = tuple(
+    min(settings.RETRY_BASE_DELAY * (2 ** attempt), _RETRY_MAX_DELAY)
+    for attempt in range(_RETRY_MAX_ATTEMPTS)
+)
+
+def parse_retry_after(exception: Exception, error_str: Optional[str] = None) -> float:
+    """
+    Extracts wait time from API error responses.
+
+    Pass error_str when the caller already has str(exception), to skip re-stringifying it.
+    """
     try:
-        # 1. Standard Retry-After header
-        if hasattr(exception, 'response') and exception.response:
-            headers = getattr(exception.response, 'headers', {})
+        # 1. Standard Retry-After header (one attribute walk instead of hasattr/getattr probes)
+        try:
+            headers = exception.response.headers
+        except AttributeError:
+            headers = None
+        if headers:
             val = headers.get('Retry-After') or headers.get('retry-after')
             if val:
-                if val.isdigit(): return float(val)
-                return (parsedate_to_datetime(val) - datetime.now(timezone.utc)).total_seconds()
+                # Delay-seconds form (almost every real response); float() also takes "12.5"
+                try:
+                    return max(0.0, float(val))
+                except ValueError:
+                    pass
+                # HTTP-date form: only worth the RFC 2822 parser if the value has letters
+                if any(c.isalpha() for c in val):
+                    return max(0.0, (parsedate_to_datetime(val) - datetime.now(timezone.utc)).total_seconds())
         
         # 2. Extract from error string/message (covers most Gemini/Groq cases)
-        # Matches: "retry in 5s", "retryDelay: '5s'"
-        error_str = str(exception)
-        if match := re.search(r'(?:retry in|retryDelay\D+)([\d.]+)s?', error_str, re.IGNORECASE):
+        # Substring guard ("retry"/"Retry") skips the regex for errors without a retry hint
+        if error_str is None:
+            error_str = str(exception)
+        if 'etry' in error_str and (match := _RETRY_DELAY_PATTERN.search(error_str)):
             return float(match.group(1))
 
     except Exception:
@@ -96,70 +379,139 @@ def parse_retry_after(exception: Exception) -> float:
 
 def _is_hard_quota_error(error_msg: str) -> bool:
     """Check if error indicates a hard billing quota that requires manual intervention."""
-    return any(k in error_msg for k in ['upgrade your plan', 'enable billing', 'billing must be enabled'])
+    return _HARD_QUOTA_PATTERN.search(error_msg) is not None
 
 async def safe_api_call(
     func: Callable[..., Any],
     *args,
     service: str = 'default',
+    cache_key: Optional[str] = None,
+    cacheable: Optional[Callable[[Any], bool]] = None,
+    token_cost: int = 0,
     **kwargs
 ) -> Any:
     """
     Unified API call wrapper with rate limiting and retry logic.
+
+    token_cost is the estimated tokens the call uses, charged against the
+    service's TPM budget (if it has one) on every attempt.
+
+    When cache_key is given (see make_cache_key), a cached response is returned
+    before touching the rate limiter, and a successful response is cached -
+    only if cacheable(response) is true, when that predicate is given, so replies
+    the caller would reject are not replayed for the whole TTL.
+    Concurrent calls with the same key are coalesced: only the first reaches the
+    API, the rest wait for it and are served from the cache.
     """
-    max_retries = settings.RETRY_MAX_ATTEMPTS
-    
-    # Define retryable exceptions
-    retryable = (ResourceExhausted, TooManyRequests, ServiceUnavailable, InternalServerError)
-    if GEMINI_ERRORS_AVAILABLE:
-        retryable += (GeminiClientError,)
+    if cache_key is None:
+        return await _call_with_retries(func, args, kwargs, service, token_cost)
+
+    cached = response_cache.get(cache_key)
+    if cached is not _CACHE_MISS:
+        logger.debug("Response cache hit for %s", service)
+        return cached
+
+    key_lock = _KEY_LOCKS.get(cache_key)
+    if key_lock is None:
+        key_lock = _KEY_LOCKS[cache_key] = _KeyLock()
+    key_lock.users += 1
+    try:
+        async with key_lock.lock:
+            # Re-check: the previous holder may have just cached this response
+            cached = response_cache.get(cache_key)
+            if cached is not _CACHE_MISS:
+                logger.debug("Coalesced duplicate call for %s", service)
+                return cached
+            response = await _call_with_retries(func, args, kwargs, service, token_cost)
+            if cacheable is None or cacheable(response):
+                response_cache.set(cache_key, response)
+            return response
+    finally:
+        key_lock.users -= 1
+        if not key_lock.users:
+            del _KEY_LOCKS[cache_key]
+
+async def _call_with_retries(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    service: str,
+    token_cost: int
+) -> Any:
+    """Run one API call under the service's concurrency and rate limits, retrying transient errors."""
+    max_retries = _RETRY_MAX_ATTEMPTS
+    concurrency = _CONCURRENCY_LIMITS.get(service) or nullcontext()
+    token_bucket = _TOKEN_BUCKETS.get(service) if token_cost > 0 else None
 
     for attempt in range(max_retries + 1):
         try:
-            await rate_limiter.acquire_slot(service)
-            return await func(*args, **kwargs)
+            # Take a concurrency permit first, so no RPM slot is spent waiting for one
+            async with (
+                concurrency,
+                rate_limiter.slot(service),
+                token_bucket.slot(token_cost) if token_bucket is not None else nullcontext()
+            ):
+                return await func(*args, **kwargs)
             
-        except retryable as e:
-            error_msg = str(e).lower()
+        except _RETRYABLE_ERRORS as e:
+            # Stringify once; SDK errors format large metadata bodies in __str__.
+            # Case-insensitive patterns avoid a lowercased copy of the message.
+            error_str = str(e)
             
             # Fail fast on hard quotas
-            if _is_hard_quota_error(error_msg):
-                logger.error(f"Hard quota exhausted for {service}: {str(e)[:200]}")
+            if _is_hard_quota_error(error_str):
+                logger.error("Hard quota exhausted for %s: %.200s", service, error_str)
                 raise RuntimeError(ERR_BILLING_REQUIRED) from e
                 
-            # Fail fast on quota exhausted (runtime) - enhanced detection
-            # Check for Gemini's actual error patterns:
-            # - "RESOURCE_EXHAUSTED" status
-            # - "exceeded your current quota" message
-            # - 429 status code
-            if any(pattern in error_msg for pattern in [
-                "resource_exhausted", 
-                "exceeded your current quota",
-                "quota exceeded",
-                "429"
-            ]):
-                logger.error(f"Quota exhausted for {service} - failing fast")
-                raise
-            
             # Stop if max retries reached
             if attempt == max_retries:
-                logger.error(f"Max retries reached for {service}: {e}")
+                logger.error("Max retries reached for %s: %s", service, error_str)
+                raise
+
+            # A daily quota won't reset within any retry window, even though Gemini's
+            # 429 still carries a "retry in Ns" hint - classify by the violated quota
+            if _DAILY_QUOTA_PATTERN.search(error_str):
+                logger.error("Daily quota exhausted for %s - failing fast", service)
                 raise
 
             # Calculate delay
-            delay = parse_retry_after(e)
+            delay = parse_retry_after(e, error_str)
+            if delay > _RETRY_HARD_CAP:
+                # A server asking for minutes/hours would stall every batch behind it
+                logger.error("Retry-after of %.0fs for %s exceeds the hard cap - failing fast", delay, service)
+                raise
+
+            # Quota exhausted (429) with neither a retry hint nor a per-minute violation:
+            # nothing says the quota resets soon, and retrying only burns time.
+            if (
+                delay == 0
+                and _QUOTA_EXHAUSTED_PATTERN.search(error_str)
+                and not _PER_MINUTE_QUOTA_PATTERN.search(error_str)
+            ):
+                logger.error("Quota exhausted for %s - failing fast", service)
+                raise
+
             if delay == 0:
-                delay = min(settings.RETRY_BASE_DELAY * (2 ** attempt), settings.RETRY_MAX_DELAY)
+                delay = random.uniform(0, _BACKOFF_DELAYS[attempt])
+            else:
+                # Honour the server's delay in full (it is already within the hard cap):
+                # retrying earlier only earns another 429. RETRY_MAX_DELAY bounds our own
+                # backoff, not the server's. A little jitter keeps callers that were
+                # throttled together from all retrying on the same tick.
+                delay += random.uniform(0, settings.RETRY_BASE_DELAY)
             
-            logger.warning(f"Retrying {service} in {delay:.1f}s (Attempt {attempt+1}) due to: {type(e).__name__}")
+            logger.warning(
+                "Retrying %s in %.1fs (Attempt %d) due to: %s", service, delay, attempt + 1, type(e).__name__
+            )
             await asyncio.sleep(delay)
             
         except Exception as e:
             # Handle Gemini 503 specifically (SDK often raises it wrapped)
             if GEMINI_ERRORS_AVAILABLE and isinstance(e, ServerError):
-                 if "503" in str(e) and "overloaded" in str(e).lower():
-                     raise RuntimeError(ERR_MODEL_OVERLOADED) from e
+                error_str = str(e)
+                if "503" in error_str and _OVERLOADED_PATTERN.search(error_str):
+                    raise RuntimeError(ERR_MODEL_OVERLOADED) from e
             
-            logger.error(f"Non-retryable error for {service}: {e}")
+            logger.error("Non-retryable error for %s: %s", service, e)
             raise
 
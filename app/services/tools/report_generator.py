@@ -1,9 +1,12 @@
-from datetime import datetime
 from typing import List, Dict, Any
+import io
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+_RULE = "==================================================\n"
+
 class ReportGenerator:
     """
     Service responsible for generating formatted reports from interview results.
@@ -22,30 +25,32 @@ class ReportGenerator:
         Returns:
             Formatted string content of the report.
         """
-        lines = []
-        lines.append("AI INTERVIEW PREPARATION RESULTS")
-        lines.append("==================================================")
-        lines.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"Source File:  {source_filename}.pdf") 
-        lines.append("==================================================")
-        lines.append("")
-        lines.append("")
+        # Write straight into one buffer: no per-line list entries, no final join copy.
+        # Each section opens with the newline that ends the previous section's blank line.
+        buf = io.StringIO()
+        w = buf.write
+        w("AI INTERVIEW PREPARATION RESULTS\n")
+        w(_RULE)
+        w(f"Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"Source File:  {source_filename}.pdf\n")
+        w(_RULE)
+        w("\n")
         
         for item in results:
             skill = item.get("skill", "Unknown Skill")
             questions = item.get("questions", [])
             
-            lines.append(f"SKILL: {skill}")
-            lines.append("-" * (len(skill) + 7))
+            w(f"\nSKILL: {skill}\n")
+            w("-" * (len(skill) + 7))
+            w("\n")
             
             if not questions:
-                lines.append("No questions generated.")
+                w("No questions generated.\n")
             else:
                 for idx, question in enumerate(questions, 1):
-                    lines.append(f"{idx}. {question}")
+                    w(f"{idx}. {question}\n")
             
-            lines.append("")
-            lines.append("==================================================")
-            lines.append("")
+            w("\n")
+            w(_RULE)
             
-        return "\n".join(lines)
+        return buf.getvalue()
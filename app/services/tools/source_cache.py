@@ -0,0 +1,125 @@
+"""
+Persistent cache for source discovery results.
+
+Grounded search is the slowest, most quota-hungry step of the pipeline, and the
+same skills recur across resumes. Results are stored per skill in a local SQLite
+file (stdlib, no extra dependency), so a repeat skill skips the Gemini call.
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# In-process tier in front of SQLite: hot skills are served without a query
+_MEMORY_MAX_ENTRIES = 1024
+
+
+class SourceCache:
+    """
+    SQLite-backed key/value cache of per-skill source content with a TTL,
+    fronted by a small in-process LRU.
+
+    Cache failures (locked or unwritable file, corruption) are logged and treated
+    as misses: the cache must never break source discovery.
+
+    The in-memory tier is checked on the event loop; SQLite work (including opening
+    the file) runs in a worker thread so disk I/O never stalls other coroutines.
+    """
+    def __init__(self, path: str, ttl_seconds: int):
+        self._path = path
+        self._ttl = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        # Serializes worker threads on the shared connection (and its lazy creation)
+        self._db_lock = threading.Lock()
+        # key -> (expires_at, content); least recently used first
+        self._memory: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    def _remember(self, key: str, expires_at: float, content: str) -> None:
+        memory = self._memory
+        memory[key] = (expires_at, content)
+        memory.move_to_end(key)
+        if len(memory) > _MEMORY_MAX_ENTRIES:
+            memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module never touches the filesystem
+        if self._conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                "key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Return {key: content} for the keys that are cached and not expired."""
+        now = time.time()
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        memory = self._memory
+        for key in keys:
+            entry = memory.get(key)
+            if entry is not None and entry[0] > now:
+                memory.move_to_end(key)
+                found[key] = entry[1]
+            else:
+                missing.append(key)
+        if not missing:
+            return found
+
+        try:
+            rows = await asyncio.to_thread(self._select, now, missing)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Source cache read failed: {e}")
+            return found
+        for key, content, expires_at in rows:
+            self._remember(key, expires_at, content)
+            found[key] = content
+        return found
+
+    async def put_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Store (key, content) pairs in one transaction, refreshing their expiry."""
+        expires_at = time.time() + self._ttl
+        rows = [(key, content, expires_at) for key, content in items]
+        if not rows:
+            return
+        for key, content, _ in rows:
+            self._remember(key, expires_at, content)
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Source cache write failed: {e}")
+
+    def _select(self, now: float, keys: List[str]) -> List[Tuple[str, str, float]]:
+        """Fetch unexpired rows for keys (runs in a worker thread)."""
+        placeholders = ",".join("?" * len(keys))
+        with self._db_lock:
+            return self._connect().execute(
+                f"SELECT key, content, expires_at FROM sources WHERE expires_at > ? AND key IN ({placeholders})",
+                (now, *keys)
+            ).fetchall()
+
+    def _write(self, rows: List[Tuple[str, str, float]]) -> None:
+        """Upsert rows in one committed transaction (runs in a worker thread)."""
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sources (key, content, expires_at) VALUES (?, ?, ?)",
+                    rows
+                )
+
+
+# Global Instance
+source_cache = SourceCache(settings.SOURCE_CACHE_PATH, settings.SOURCE_CACHE_TTL_SECONDS)
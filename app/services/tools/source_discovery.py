@@ -15,89 +15,100 @@ from google.api_core.exceptions import (
 )
 
 from app.core.llm import get_genai_client, GEMINI_MODEL
-from app.services.tools.helpers import optimize_search_query, parse_batch_response, create_fallback_sources
-from app.services.tools.rate_limiter import safe_api_call
+from app.services.tools.helpers import (
+    optimize_search_query, parse_batch_response, create_fallback_sources, NO_SOURCES_PREFIX, FALLBACK_PREFIX
+)
+from app.services.tools.rate_limiter import safe_api_call, make_cache_key
+from app.services.tools.source_cache import source_cache
 from app.core.config import settings
 from app.core.exceptions import SourceDiscoveryError
 
 logger = logging.getLogger(__name__)
 
+# Grounding config is a constant value object: build (and validate) it once, not per batch
+_GROUNDING_TOOL = types.Tool(google_search=types.GoogleSearch())
+_GEN_CONFIG = types.GenerateContentConfig(tools=[_GROUNDING_TOOL])
+
+
+def _safe_optimize_query(skill: str) -> str:
+    """Optimized search query for a skill, falling back to the raw skill on failure."""
+    try:
+        return optimize_search_query(skill)
+    except Exception as e:
+        logger.warning(f"Query optimization failed for '{skill}': {e}")
+        return skill
+
 
 def _build_skills_block_with_queries(skills: List[str]) -> str:
     """Build formatted skills block with optimized search queries."""
-    skills_with_queries = []
-    for skill in skills:
-        try:
-            opt_query = optimize_search_query(skill)
-            skills_with_queries.append(f"- Skill: {skill} -> Query: {opt_query}")
-        except Exception as e:
-            logger.warning(f"Query optimization failed for '{skill}': {e}")
-            skills_with_queries.append(f"- Skill: {skill} -> Query: {skill}")
-    
-    return "\n".join(skills_with_queries)
+    return "\n".join([f"- Skill: {skill} -> Query: {_safe_optimize_query(skill)}" for skill in skills])
+
+
+# Detailed discovery prompt, assembled once; only the skills block and count vary per batch
+_DETAILED_PROMPT_TEMPLATE = "\n".join([
+    "You are an expert technical researcher. Perform a 'Split-Search' for the following skills.\n",
+    "{skills_block}\n",
+    "INSTRUCTIONS:\n",
+    "1. GOAL: Extract dense, technical content for expert interviewers Focus on fundamental concepts and definitions and  practical scenarios.\n",
+    "2. SOURCE REQUIREMENTS:\n",
+    f"   - ##STRICLY## Find AT MOST {settings.MAX_SOURCES_PER_SKILL} DIVERSE technical sources for EACH skill\n",
+    "   - Ensure comprehensive coverage from multiple perspectives\n",
+    "3. SOURCE HANDLING: Use Google Search to find information, BUT:\n",
+    "   - Synthesize the knowledge into your own words.\n",
+    "   - Do NOT output a 'Sources' or 'References' list.\n",
+    "   - Do NOT output URLs or website titles in the text.\n",
+    "   - The final output must look like pure expert knowledge.\n",
+    "\n4. CRITICAL OUTPUT FORMAT (follow this EXACTLY):\n",
+    "   For EACH skill, create ONE section with this EXACT structure:\n",
+    "   \n",
+    "   ## Artificial Intelligence\n",
+    "   [Technical content paragraphs here...]\n",
+    "   \n",
+    "   ## Machine Learning\n",
+    "   [Technical content paragraphs here...]\n",
+    "   \n",
+    "   RULES:\n",
+    "   - Header MUST start with '## ' (two hashes and ONE space)\n",
+    "   - Header MUST match the skill name EXACTLY (preserve capitalization, spaces, special chars)\n",
+    "   - Do NOT add colons, quotes, or extra words to headers\n",
+    "   - Do NOT skip any skills - provide ALL {skill_count} sections\n",
+    "   - Separate each section with blank lines for clarity\n"
+])
 
 
-def _build_detailed_prompt(skills_block: str) -> str:
+def _build_detailed_prompt(skills_block: str, skill_count: int) -> str:
     """Build detailed prompt for initial source discovery with query optimization."""
-    from app.core.config import settings
-    max_sources = settings.MAX_SOURCES_PER_SKILL
-    
-    return "\n".join([
-        "You are an expert technical researcher. Perform a 'Split-Search' for the following skills.\n",
-        f"{skills_block}\n",
-        "INSTRUCTIONS:\n",
-        "1. GOAL: Extract dense, technical content for expert interviewers Focus on fundamental concepts and definitions and  practical scenarios.\n",
-        "2. SOURCE REQUIREMENTS:\n",
-        f"   - ##STRICLY## Find AT MOST {max_sources} DIVERSE technical sources for EACH skill\n",
-        "   - Ensure comprehensive coverage from multiple perspectives\n",
-        "3. SOURCE HANDLING: Use Google Search to find information, BUT:\n",
-        "   - Synthesize the knowledge into your own words.\n",
-        "   - Do NOT output a 'Sources' or 'References' list.\n",
-        "   - Do NOT output URLs or website titles in the text.\n",
-        "   - The final output must look like pure expert knowledge.\n",
-        "\n4. CRITICAL OUTPUT FORMAT (follow this EXACTLY):\n",
-        "   For EACH skill, create ONE section with this EXACT structure:\n",
-        "   \n",
-        "   ## Artificial Intelligence\n",
-        "   [Technical content paragraphs here...]\n",
-        "   \n",
-        "   ## Machine Learning\n",
-        "   [Technical content paragraphs here...]\n",
-        "   \n",
-        "   RULES:\n",
-        "   - Header MUST start with '## ' (two hashes and ONE space)\n",
-        "   - Header MUST match the skill name EXACTLY (preserve capitalization, spaces, special chars)\n",
-        "   - Do NOT add colons, quotes, or extra words to headers\n",
-        "   - Do NOT skip any skills - provide ALL {len(skills_block.split('\n'))} sections\n",
-        "   - Separate each section with blank lines for clarity\n"
-    ])
+    return _DETAILED_PROMPT_TEMPLATE.format(skills_block=skills_block, skill_count=skill_count)
+
+
+# Simplified retry prompt, assembled once like the detailed one
+_SIMPLIFIED_PROMPT_TEMPLATE = (
+    "You are an expert technical researcher. Search for the following skills and provide technical content.\n\n"
+    "{skills_block}\n\n"
+    "Create {skill_count} section(s) using this EXACT format:\n\n"
+    "## [Exact Skill Name From Above]\n"
+    "[Technical content paragraphs...]\n\n"
+    "CRITICAL RULES:\n"
+    "- Use '## ' (two hashes + ONE space) before each skill name\n"
+    "- Match skill names EXACTLY as listed above (same capitalization, punctuation)\n"
+    "- Do NOT add colons, quotes, or extra words to headers\n"
+    "- You MUST create exactly {skill_count} section(s) - one for each skill listed\n"
+)
 
 
 def _build_simplified_prompt(skills: List[str]) -> str:
     """Build simplified retry prompt without query optimization."""
     skills_block = "\n".join([f"- {skill}" for skill in skills])
-    skill_count = len(skills)
-    
-    return (
-        "You are an expert technical researcher. Search for the following skills and provide technical content.\n\n"
-        f"{skills_block}\n\n"
-        f"Create {skill_count} section(s) using this EXACT format:\n\n"
-        "## [Exact Skill Name From Above]\n"
-        "[Technical content paragraphs...]\n\n"
-        "CRITICAL RULES:\n"
-        "- Use '## ' (two hashes + ONE space) before each skill name\n"
-        "- Match skill names EXACTLY as listed above (same capitalization, punctuation)\n"
-        "- Do NOT add colons, quotes, or extra words to headers\n"
-        f"- You MUST create exactly {skill_count} section(s) - one for each skill listed\n"
-    )
+    return _SIMPLIFIED_PROMPT_TEMPLATE.format(skills_block=skills_block, skill_count=len(skills))
 
 
 def _extract_grounding_metadata(response: Any) -> Optional[Any]:
     """Extract and normalize grounding metadata from Gemini response."""
-    if not (response.candidates and response.candidates[0].grounding_metadata):
+    candidates = response.candidates
+    grounding_meta = candidates[0].grounding_metadata if candidates else None
+    if not grounding_meta:
         return None
     
-    grounding_meta = response.candidates[0].grounding_metadata
     # Ensure grounding_chunks is a list, not None
     if getattr(grounding_meta, "grounding_chunks", None) is None:
         grounding_meta.grounding_chunks = []
@@ -117,13 +128,48 @@ def _log_response_debug_info(response_text: str, context: str):
              logger.warning(f"Empty response received from Gemini for {context}")
 
 
+# Responses shorter than this (chars) can't hold even one real section
+_MIN_RESPONSE_CHARS = 100
+
+
+def _is_usable_response(response: Any) -> bool:
+    """Whether a raw Gemini response is worth caching: too-short replies are never parsed."""
+    return len(response.text or "") >= _MIN_RESPONSE_CHARS
+
+
+# Responses longer than this (chars) are parsed in a worker thread so the regex and
+# metadata passes don't stall other batches' coroutines on the event loop
+_OFFLOAD_PARSE_THRESHOLD = 50_000
+
+# Rough chars-per-token ratio for English prompts, used to charge the Gemini TPM budget
+_CHARS_PER_TOKEN = 4
+
+# Bump when the discovery prompt or query template changes, to invalidate cached sources
+_SOURCE_CACHE_VERSION = "v2"
+
+
+def _source_cache_key(skill: str) -> str:
+    """Persistent cache key for one skill: everything that shapes its discovered content."""
+    # Normalized like discover_sources' dedupe, so "Python" and " python" share an entry
+    return make_cache_key(
+        _SOURCE_CACHE_VERSION, GEMINI_MODEL, str(settings.MAX_SOURCES_PER_SKILL), skill.strip().lower()
+    )
+
+
+def _is_cacheable(result: Dict) -> bool:
+    """Only real search results are persisted; fallbacks should be retried next run."""
+    content = result.get("extracted_content", "")
+    return bool(content) and not content.startswith((NO_SOURCES_PREFIX, FALLBACK_PREFIX))
+
+
 def _separate_failed_skills(parsed_results: List[Dict]) -> Tuple[List[str], List[Dict]]:
     """Separate failed skills from successful results based on fallback content detection."""
     failed_skills = []
     successful_results = []
     
+    # Parser output always carries extracted_content, and placeholders only ever lead it
     for result in parsed_results:
-        if "No sources found" in result.get("extracted_content", ""):
+        if result["extracted_content"].startswith(NO_SOURCES_PREFIX):
             failed_skills.append(result["skill"])
         else:
             successful_results.append(result)
@@ -135,7 +181,8 @@ async def _call_gemini_api(
     client: Any,
     prompt: str,
     config: types.GenerateContentConfig,
-    context: str
+    context: str,
+    cache: bool = True
 ) -> Tuple[str, Optional[Any]]:
     """
     Execute Gemini API call and return response text with metadata.
@@ -145,6 +192,8 @@ async def _call_gemini_api(
         prompt: Prompt to send to Gemini
         config: Generation config with tools
         context: Context string for logging (e.g., "batch: ['skill1', 'skill2']")
+        cache: Reuse/store the response for identical prompts. Retries pass False,
+            since they exist to get a different answer than last time
     
     Returns:
         Tuple of (response_text, grounding_metadata)
@@ -152,16 +201,19 @@ async def _call_gemini_api(
     logger.info(f"⏱️ Gemini API call started for {context}")
     start_time = time.perf_counter()
     
-    # Create async wrapper for synchronous Gemini SDK call
-    async def _async_wrapper():
-        return await asyncio.to_thread(
-            client.models.generate_content,
-            model=GEMINI_MODEL,
-            contents=prompt,
-            config=config
-        )
-    
-    response = await safe_api_call(_async_wrapper, service='gemini')
+    # Native async SDK call: no thread-pool hop, so concurrency isn't capped by executor workers.
+    # Grounded search results are stable enough to reuse for identical prompts,
+    # as long as the reply was long enough to hold sections at all.
+    response = await safe_api_call(
+        client.aio.models.generate_content,
+        service='gemini',
+        cache_key=make_cache_key(GEMINI_MODEL, prompt) if cache else None,
+        cacheable=_is_usable_response,
+        token_cost=len(prompt) // _CHARS_PER_TOKEN,
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=config
+    )
     
     elapsed = time.perf_counter() - start_time
     logger.info(f"⏱️ Gemini API call completed in {elapsed:.2f}s for {context}")
@@ -182,55 +234,65 @@ async def _retry_failed_skills(
     client: Any,
     config: types.GenerateContentConfig,
     failed_skills: List[str],
-    successful_results: List[Dict],
-    original_results: List[Dict]
+    successful_results: List[Dict]
 ) -> List[Dict]:
     """
-    Retry source discovery for failed skills IN PARALLEL with simplified prompt.
+    Retry source discovery for failed skills with a simplified prompt.
     
-    Each failed skill is retried individually in parallel for maximum concurrency.
+    Failed skills are retried together in one call. If that call resolves some of
+    them, the rest are split in half and retried the same way; if it resolves none,
+    splitting is unlikely to help and each remaining skill gets its own call.
     
     Args:
         client: GenAI client instance
         config: Generation config with tools
         failed_skills: List of skills that failed parsing
         successful_results: Successfully parsed results from initial attempt
-        original_results: Original results including fallbacks
     
     Returns:
         Combined list of successful and retry results
     """
-    logger.info(f"Retrying source discovery for {len(failed_skills)} failed skill(s) IN PARALLEL: {failed_skills}")
+    logger.info(f"Retrying source discovery for {len(failed_skills)} failed skill(s): {failed_skills}")
+    retry_results = await _retry_skills_batched(client, config, failed_skills)
     
-    async def retry_single_skill(skill: str) -> Dict:
-        """Retry a single skill with simplified prompt."""
-        try:
-            logger.debug(f"Retry attempt for single skill: {skill}")
-            
-            # Build simplified prompt for single skill
-            retry_prompt = _build_simplified_prompt([skill])
-            
-            # Call API with retry prompt
-            retry_text, retry_meta = await _call_gemini_api(
-                client,
-                retry_prompt,
-                config,
-                f"retry skill: {skill}"
-            )
-            
-            # Parse retry results (should return 1 item)
-            retry_results = parse_batch_response(retry_text, [skill], retry_meta)
-            return retry_results[0] if retry_results else create_fallback_sources(skill, "Retry parsing failed")
-            
-        except Exception as retry_error:
-            logger.warning(f"Retry failed for skill '{skill}': {retry_error}")
-            return create_fallback_sources(skill, f"Retry error: {retry_error}")
+    # Merge successful original results with retry results
+    return successful_results + retry_results
+
+
+async def _retry_skills_batched(
+    client: Any,
+    config: types.GenerateContentConfig,
+    skills: List[str]
+) -> List[Dict]:
+    """Retry skills in one simplified-prompt call, then bisect or fan out whatever is still missing."""
+    try:
+        retry_text, retry_meta = await _call_gemini_api(
+            client,
+            _build_simplified_prompt(skills),
+            config,
+            f"retry: {skills}",
+            cache=False
+        )
+        retry_results = parse_batch_response(retry_text, skills, retry_meta)
+    except Exception as retry_error:
+        # Errors reaching here already went through safe_api_call's retries: splitting won't help
+        logger.warning(f"Retry failed for skills {skills}: {retry_error}")
+        return [create_fallback_sources(skill, f"Retry error: {retry_error}") for skill in skills]
     
-    # Execute all retries in parallel with asyncio.gather
-    retry_results = await asyncio.gather(*[retry_single_skill(skill) for skill in failed_skills])
+    still_failed, resolved = _separate_failed_skills(retry_results)
+    if not still_failed or len(skills) == 1:
+        return retry_results
     
-    # Merge successful original results with retry results
-    return successful_results + list(retry_results)
+    if not resolved:
+        # Nothing came back: bisecting would spend ~2K-1 calls, one call per skill costs K
+        parts = [[skill] for skill in still_failed]
+    else:
+        # Each part is strictly smaller than this call's skills, so the recursion ends at single skills
+        mid = (len(still_failed) + 1) // 2
+        parts = [part for part in (still_failed[:mid], still_failed[mid:]) if part]
+    logger.info(f"Batched retry missed {len(still_failed)}/{len(skills)} skill(s); retrying in {len(parts)} part(s)")
+    part_results = await asyncio.gather(*[_retry_skills_batched(client, config, part) for part in parts])
+    return resolved + [result for results in part_results for result in results]
 
 
 async def discover_sources(skills: List[str]) -> List[Dict]:
@@ -246,29 +308,54 @@ async def discover_sources(skills: List[str]) -> List[Dict]:
     Raises:
         SourceDiscoveryError: If source discovery fails critically
     """
-    results = []
-    chunk_size = 3
+    # Normalized duplicates ("Python" / "python ") share one search
+    unique: Dict[str, str] = {}
+    for skill in skills:
+        unique.setdefault(skill.strip().lower(), skill)
+    if len(unique) == len(skills):
+        return await _discover_unique_sources(skills)
+    
+    logger.info(f"Deduplicated {len(skills)} skills to {len(unique)} searches")
+    results = await _discover_unique_sources(list(unique.values()))
+    
+    # Fan results back out to every original position, under the caller's spelling
+    content_by_key = {
+        key: result["extracted_content"] for key, result in zip(unique, results)
+    }
+    return [
+        {"skill": skill, "extracted_content": content_by_key[skill.strip().lower()]}
+        for skill in skills
+    ]
+
+
+async def _discover_unique_sources(skills: List[str]) -> List[Dict]:
+    """Discover sources for skills that are already free of duplicates, preserving their order."""
+    chunk_size = max(1, settings.SOURCE_DISCOVERY_BATCH_SIZE)
+    
+    # Serve repeat skills from the persistent cache; only misses reach Gemini
+    cache_keys: Dict[str, str] = {}
+    cached: Dict[str, str] = {}
+    if settings.SOURCE_CACHE_ENABLED:
+        cache_keys = {skill: _source_cache_key(skill) for skill in skills}
+        cached = await source_cache.get_many(list(cache_keys.values()))
+    pending = [skill for skill in skills if cache_keys.get(skill) not in cached]
+    if len(pending) < len(skills):
+        logger.info(f"Source cache hit for {len(skills) - len(pending)}/{len(skills)} skill(s)")
+    if not pending:
+        return [{"skill": skill, "extracted_content": cached[cache_keys[skill]]} for skill in skills]
     
     # Batch skills to optimize token usage
-    batches = [skills[i:i + chunk_size] for i in range(0, len(skills), chunk_size)]
+    batches = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
     
-    # Initialize client once to save overhead
-    try:
-        client = get_genai_client()
-    except Exception as e:
-        error_msg = f"Failed to initialize GenAI client: {e}"
-        logger.error(error_msg)
-        raise SourceDiscoveryError(error_msg, details={"skills": skills}) from e
+    # Process-wide client, built (and validated) when app.core.llm is imported
+    client = get_genai_client()
 
     async def process_batch(chunk: List[str]) -> List[Dict]:
-        """Process a single batch of skills with parallel retry logic."""
+        """Process a single batch of skills, retrying missed skills in batched calls."""
         # Build prompt with optimized queries
         skills_block = _build_skills_block_with_queries(chunk)
-        prompt = _build_detailed_prompt(skills_block)
-        
-        # Configure grounding tool
-        grounding_tool = types.Tool(google_search=types.GoogleSearch())
-        config = types.GenerateContentConfig(tools=[grounding_tool])
+        prompt = _build_detailed_prompt(skills_block, len(chunk))
+        config = _GEN_CONFIG
 
         try:
             # Execute initial API call
@@ -292,20 +379,28 @@ async def discover_sources(skills: List[str]) -> List[Dict]:
                 details={"batch": chunk, "error": str(e)}
             ) from e
         
+        # Too short to parse into anything useful: skip the parse and send the whole
+        # chunk straight to the retry it would have ended up in anyway
+        if len(response_text) < _MIN_RESPONSE_CHARS:
+            logger.warning(f"Response too short ({len(response_text)} chars) for batch {chunk}")
+            return await _retry_failed_skills(client, config, chunk, [])
+        
         # Parse initial response (outside try block - parsing errors should propagate)
-        parsed_results = parse_batch_response(response_text, chunk, grounding_meta)
+        if len(response_text) > _OFFLOAD_PARSE_THRESHOLD:
+            parsed_results = await asyncio.to_thread(parse_batch_response, response_text, chunk, grounding_meta)
+        else:
+            parsed_results = parse_batch_response(response_text, chunk, grounding_meta)
         
         # Separate failed and successful skills
         failed_skills, successful_results = _separate_failed_skills(parsed_results)
         
-        # Retry failed skills in PARALLEL if any
+        # Retry failed skills if any
         if failed_skills:
             return await _retry_failed_skills(
                 client,
                 config,
                 failed_skills,
-                successful_results,
-                parsed_results
+                successful_results
             )
         
         return parsed_results
@@ -323,9 +418,19 @@ async def discover_sources(skills: List[str]) -> List[Dict]:
             details={"skills": skills, "error": str(e)}
         ) from e
     
-    # Flatten results
-    for batch_res in batch_results_list:
-        results.extend(batch_res)
+    # Flatten results, persisting real search results for future runs
+    fresh = {result["skill"]: result for batch_res in batch_results_list for result in batch_res}
+    if settings.SOURCE_CACHE_ENABLED:
+        await source_cache.put_many(
+            (cache_keys[skill], result["extracted_content"])
+            for skill, result in fresh.items()
+            if skill in cache_keys and _is_cacheable(result)
+        )
 
-    return results
+    # Reassemble in the caller's skill order
+    return [
+        fresh[skill] if skill in fresh
+        else {"skill": skill, "extracted_content": cached[cache_keys[skill]]}
+        for skill in skills
+    ]
 